@@ -9,8 +9,12 @@ def keep_regs(df, regs):
 
     """ 
     
-    for r in regs:
-        I = df.reg.str.contains(r)
-        df = df.loc[I == False] # keep everything else
+    # nothing to drop; joining zero patterns would match every row
+    if not regs:
+        return df
+
+    # one combined pattern -> one pass over the data instead of one per region
+    I = df.reg.str.contains('|'.join(regs))
+    df = df.loc[I == False] # keep everything else
     
     return df
\ No newline at end of file
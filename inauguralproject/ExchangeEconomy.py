@@ -1,4 +1,82 @@
 import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, fastmath=True)
+def _utility(x1, x2, pref, pref_c):
+    '''Cobb-Douglas utility kernel. Numba fuses the two powers and the
+    product into one compiled expression, for scalar or vector demands.
+    pref_c is the pre-computed complement share 1-pref.'''
+    return x1**pref * x2**pref_c
+
+
+def _buffered_ok(x1, x2):
+    '''The allocation-free utility path needs two same-shape 1-D float
+    arrays; anything else (scalars mixed in, N-d grids, broadcasting)
+    goes through the _utility expression kernel instead.'''
+    return (isinstance(x1, np.ndarray) and isinstance(x2, np.ndarray)
+            and x1.ndim == 1 and x1.shape == x2.shape
+            and x1.dtype.kind == 'f' and x2.dtype.kind == 'f')
+
+
+@njit(cache=True, fastmath=True)
+def _utility_into(x1, x2, pref, pref_c, out):
+    '''Vector utility kernel writing into a caller-owned buffer, so
+    repeated evaluations on same-sized grids allocate nothing.'''
+    for i in range(x1.size):
+        out[i] = x1[i]**pref * x2[i]**pref_c
+
+
+@njit(cache=True, fastmath=True)
+def _utility_log(x1, x2, pref, pref_c):
+    '''Log-transformed Cobb-Douglas utility kernel. Two logs and an FMA
+    replace the two pow calls; the ordering of allocations is unchanged
+    since log is monotone.'''
+    return pref * np.log(x1) + pref_c * np.log(x2)
+
+
+@njit(cache=True, fastmath=True)
+def _demand(p1, pref_w1, pref_w2, prefc_w1, prefc_w2):
+    '''Demand kernel on pre-scaled endowments. With a*(w1*p1+w2)/p1
+    rewritten as a*w1 + a*w2/p1 (and analogously for good 2), each call
+    is just an add, a division and an FMA per good.'''
+    return pref_w1 + pref_w2 / p1, prefc_w1 * p1 + prefc_w2
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _err_kernel(p1, alpha, beta, w1A, w2A, out1, out2):
+    '''Fused market-clearing-error kernel. One parallel pass over the
+    price grid writes both errors into caller-owned buffers, instead of
+    building demands and errors through six ufunc passes with a
+    temporary array each.'''
+    for i in prange(p1.size):
+        pi = p1[i]
+        inc_A = w1A * pi + w2A
+        inc_B = (1 - w1A) * pi + (1 - w2A)
+        out1[i] = alpha * inc_A / pi + beta * inc_B / pi - 1.0
+        out2[i] = (1 - alpha) * inc_A + (1 - beta) * inc_B - 1.0
+
+
+@njit(fastmath=True, cache=True)
+def _mc_kernel(p1, alpha, beta, w1A, w2A):
+    '''Single-pass market clearing search. Streams the price grid once
+    and tracks the running argmin of |eps1|+|eps2| without materializing
+    any error array. Serial on purpose: prange cannot carry an argmin
+    reduction, and one pass over the grid is bandwidth-bound anyway.'''
+    best_err = np.inf
+    best_i = 0
+    for i in range(p1.size):
+        pi = p1[i]
+        inc_A = w1A * pi + w2A
+        inc_B = (1 - w1A) * pi + (1 - w2A)
+        eps1 = alpha * inc_A / pi + beta * inc_B / pi - 1.0
+        eps2 = (1 - alpha) * inc_A + (1 - beta) * inc_B - 1.0
+        err = abs(eps1) + abs(eps2)
+        if err < best_err:
+            best_err = err
+            best_i = i
+    return best_i
+
 
 class ExchangeEconomyClass:
     '''A class of two agents in an exchange economy that maximizes utililty based on (initial) endowments and preference parameters.
@@ -21,10 +99,85 @@ class ExchangeEconomyClass:
             w1A (float): A's endowment of good 1.
             w2A (float): A's endowment of good 2.
         '''
-        self.alpha = alpha
-        self.beta = beta
-        self.w1A = w1A
-        self.w2A = w2A
+        self._alpha = alpha
+        self._beta = beta
+        self._w1A = w1A
+        self._w2A = w2A
+
+        # output buffers for the fused error kernel, reused across calls
+        self._err_buf1 = None
+        self._err_buf2 = None
+
+        # scratch buffers for vectorized utility calls (one per agent,
+        # so utility_A and utility_B results never alias)
+        self._util_bufA = None
+        self._util_bufB = None
+
+        self._update_derived()
+
+    def _update_derived(self):
+        '''
+        Refresh the constants hoisted out of the per-call demand formulas.
+        Runs in __init__ and whenever a parameter is re-assigned, so e.g.
+        setting model.w1A keeps the cached products in sync.
+        '''
+        alpha, beta = self._alpha, self._beta
+        w1A, w2A = self._w1A, self._w2A
+
+        # cached clearing prices depend on the parameters, so drop them
+        self._mc_cache = {}
+
+        # complement shares and B's implied endowments
+        self.alpha_c = 1 - alpha
+        self.beta_c = 1 - beta
+        self.w1B = 1 - w1A
+        self.w2B = 1 - w2A
+
+        self._aA_w1 = alpha * w1A
+        self._aA_w2 = alpha * w2A
+        self._maA_w1 = self.alpha_c * w1A
+        self._maA_w2 = self.alpha_c * w2A
+
+        self._bB_w1 = beta * self.w1B
+        self._bB_w2 = beta * self.w2B
+        self._mbB_w1 = self.beta_c * self.w1B
+        self._mbB_w2 = self.beta_c * self.w2B
+
+    @property
+    def alpha(self):
+        return self._alpha
+
+    @alpha.setter
+    def alpha(self, value):
+        self._alpha = value
+        self._update_derived()
+
+    @property
+    def beta(self):
+        return self._beta
+
+    @beta.setter
+    def beta(self, value):
+        self._beta = value
+        self._update_derived()
+
+    @property
+    def w1A(self):
+        return self._w1A
+
+    @w1A.setter
+    def w1A(self, value):
+        self._w1A = value
+        self._update_derived()
+
+    @property
+    def w2A(self):
+        return self._w2A
+
+    @w2A.setter
+    def w2A(self, value):
+        self._w2A = value
+        self._update_derived()
 
     def utility_A(self,x1A,x2A):
         '''
@@ -35,13 +188,18 @@ class ExchangeEconomyClass:
             x2A (float/int): A's demand for good 2.
         
         Returns:
-        float/int: Numeric utility value.
+        float/int: Numeric utility value. Vector calls return a scratch
+        buffer that is overwritten by the next vector call; copy it if
+        it needs to survive.
         '''
 
-        alpha = self.alpha
+        if _buffered_ok(x1A, x2A):
+            if self._util_bufA is None or self._util_bufA.size != x1A.size:
+                self._util_bufA = np.empty(x1A.size)
+            _utility_into(x1A, x2A, self._alpha, self.alpha_c, self._util_bufA)
+            return self._util_bufA
 
-        util = x1A**alpha * x2A**(1 - alpha)
-        return util
+        return _utility(x1A, x2A, self._alpha, self.alpha_c)
 
     def utility_B(self,x1B,x2B):
         '''
@@ -52,13 +210,49 @@ class ExchangeEconomyClass:
             x2B (float/int): B's demand for good 2.
         
         Returns:
-        float/int: Numeric utility value.
+        float/int: Numeric utility value. Vector calls return a scratch
+        buffer that is overwritten by the next vector call; copy it if
+        it needs to survive.
+        '''
+
+        if _buffered_ok(x1B, x2B):
+            if self._util_bufB is None or self._util_bufB.size != x1B.size:
+                self._util_bufB = np.empty(x1B.size)
+            _utility_into(x1B, x2B, self._beta, self.beta_c, self._util_bufB)
+            return self._util_bufB
+
+        return _utility(x1B, x2B, self._beta, self.beta_c)
+
+    def utility_A_log(self,x1A,x2A):
+        '''
+        Log of A's utility. Cheaper than utility_A (no pow calls) and gives
+        the same ranking of allocations, so use it wherever utility is only
+        compared, not reported.
+
+        Parameters:
+            x1A (float/int): A's demand for good 1.
+            x2A (float/int): A's demand for good 2.
+
+        Returns:
+        float/int: Numeric log-utility value.
         '''
-        
-        beta = self.beta
-        util = x1B**beta * x2B**(1 - beta)
 
-        return util
+        return _utility_log(x1A, x2A, self._alpha, self.alpha_c)
+
+    def utility_B_log(self,x1B,x2B):
+        '''
+        Log of B's utility. Same ranking as utility_B at lower cost; see
+        utility_A_log.
+
+        Parameters:
+            x1B (float/int): B's demand for good 1.
+            x2B (float/int): B's demand for good 2.
+
+        Returns:
+        float/int: Numeric log-utility value.
+        '''
+
+        return _utility_log(x1B, x2B, self._beta, self.beta_c)
 
     def demand_A(self,p1):
         '''
@@ -70,12 +264,7 @@ class ExchangeEconomyClass:
             x1A, X2A (tuple, float/int): Tuple of quantity demanded by agent B
         '''
         
-        w1A, w2A = self.w1A, self.w2A
-        alpha = self.alpha
-        x1A = alpha * (w1A * p1 + w2A) / p1
-        x2A = (1 - alpha) * (w1A * p1 + w2A)
-
-        return x1A, x2A
+        return _demand(p1, self._aA_w1, self._aA_w2, self._maA_w1, self._maA_w2)
 
     def demand_B(self,p1):
         '''
@@ -87,12 +276,7 @@ class ExchangeEconomyClass:
             x1B, X2B (tuple, float/int): Tuple of quantity demanded by agent B
         '''
         
-        w1B, w2B = (1 - self.w1A), (1 - self.w2A)
-        beta = self.beta
-        x1B = beta * (w1B * p1 + w2B) / p1
-        x2B = (1 - beta) * (w1B * p1 + w2B)
-
-        return x1B, x2B
+        return _demand(p1, self._bB_w1, self._bB_w2, self._mbB_w1, self._mbB_w2)
 
     def market_clear_err(self,p1):
         '''
@@ -103,11 +287,20 @@ class ExchangeEconomyClass:
                 The price used in the market.
         '''
 
+        if isinstance(p1, np.ndarray):
+            # single fused pass over the grid, into buffers reused across calls
+            if self._err_buf1 is None or self._err_buf1.size != p1.size:
+                self._err_buf1 = np.empty(p1.size)
+                self._err_buf2 = np.empty(p1.size)
+            _err_kernel(p1, self._alpha, self._beta, self._w1A, self._w2A,
+                        self._err_buf1, self._err_buf2)
+            return self._err_buf1, self._err_buf2
+
         x1A,x2A = self.demand_A(p1)
         x1B,x2B = self.demand_B(p1)
 
-        eps1 = x1A-self.w1A + x1B-(1-self.w1A)
-        eps2 = x2A-self.w2A + x2B-(1-self.w2A)
+        eps1 = x1A-self.w1A + x1B-self.w1B
+        eps2 = x2A-self.w2A + x2B-self.w2B
 
         return eps1,eps2
     
@@ -119,18 +312,23 @@ class ExchangeEconomyClass:
             P_1: np.ndarray
                 Vector of possible prices.
         '''
-        eps_1,eps_2=self.market_clear_err(P_1)
-
-        # Make a vector with difference between errors in markets
-        EPS = eps_1-eps_2
+        P_1 = np.asarray(P_1, dtype=np.float64)
 
-        # Use python-built in functions to find the minimum absolute error
-        minerr=abs(EPS).min()
+        # Re-running a notebook cell with the same grid hits the cache
+        # instead of re-scanning. Keyed by grid content: hashing the
+        # bytes is one cheap pass, unlike id(), which can be recycled
+        # once the caller's array dies. Parameter setters clear the cache.
+        key = P_1.tobytes()
+        market_clearing_p = self._mc_cache.get(key)
+        if market_clearing_p is not None:
+            return market_clearing_p
 
-        # Make vector indices to pass to price vector
-        ids=abs(EPS)==minerr
+        # One fused pass computes both errors per price and keeps the
+        # running argmin of |eps1|+|eps2|, with no intermediate arrays
+        ids = _mc_kernel(P_1, self._alpha, self._beta, self._w1A, self._w2A)
 
         # Calculate market clearing price of price in P_1
-        market_clearing_p=P_1[ids][0]
+        market_clearing_p=P_1[ids]
+        self._mc_cache[key] = market_clearing_p
 
         return market_clearing_p
\ No newline at end of file
@@ -16,7 +16,8 @@ def solve_ss(alpha, c):
     f = lambda k: k**alpha - c
     obj = lambda kss: kss - f(kss)
 
-    #. b. call root finder to find kss.
-    result = optimize.root_scalar(obj,bracket=[0.1,100],method='bisect')
+    #. b. call root finder to find kss. Brent's method converges in far
+    # fewer iterations than bisection on the same bracket.
+    result = optimize.root_scalar(obj,bracket=[0.1,100],method='brentq')
     
     return result
\ No newline at end of file